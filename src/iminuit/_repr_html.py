@@ -1,4 +1,4 @@
-from ._repr_text import pdg_format, matrix_format, fmin_fields
+from ._repr_text import pdg_format, fmin_fields
 
 good_style = "background-color:#92CCA6;color:black"
 bad_style = "background-color:#c15ef7;color:black"
@@ -279,11 +279,11 @@ def merrors(mes):
 
 
 def matrix(arr):
-    names = tuple(arr._var2pos)
+    names = arr._names
 
     n = len(names)
 
-    nums = matrix_format(arr.flatten())
+    nums = arr._matrix_format()
 
     grad = ColorGradient(
         (-1.0, 120.0, 120.0, 250.0),
@@ -3,6 +3,9 @@ import re
 import numpy as np
 
 
+_ZERO = re.compile(r"(-?)0\.0+$")
+
+
 def pdg_format(value, *errors):
     if value is None:
         strings, nexp = _round((0, *errors), None, None)
@@ -16,7 +19,7 @@ def pdg_format(value, *errors):
                 continue
             m = None
             if i == 0:
-                m = re.match(r"(-?)0\.0+$", s)
+                m = _ZERO.match(s)
                 if m:
                     s = m.group(1) + "0"
             suffix = ""
@@ -178,10 +181,10 @@ def merrors(mes):
 
 
 def matrix(arr):
-    names = tuple(arr._var2pos)
+    names = arr._names
 
     n = len(arr)
-    nums = matrix_format(arr.flatten())
+    nums = arr._matrix_format()
 
     def row_fmt(args):
         s = "│ " + args[0] + " │"
@@ -47,6 +47,11 @@ perform well. If you have trouble with your own implementations, try these.
 The binned versions of the log-likelihood fits support weighted samples. For each bin of
 the histogram, the sum of weights and the sum of squared weights is needed then, see class
 documentation for details.
+
+If Numba is installed, sums over large inputs are computed with several threads if the
+TBB threading layer of Numba is selected, by setting the environment variable
+``NUMBA_THREADING_LAYER=tbb``. Other threading layers are not safe to use from several
+threads or after a fork, so the computation is single-threaded otherwise.
 """
 
 from .util import (
@@ -58,7 +63,10 @@ from .util import (
 )
 import numpy as np
 from collections.abc import Sequence
+from operator import itemgetter
+from types import FunctionType
 import abc
+import threading
 import typing as _tp
 import warnings
 
@@ -79,17 +87,26 @@ def _unbinned_nll(x):
     return -np.sum(_safe_log(x))
 
 
-def _z_squared(y, ye, ym):
-    z = (y - ym) / ye
-    return z * z
+def _unbinned_nll_log(logx):
+    return -np.sum(logx)
+
+
+def _z_squared(y, ivar, ym):
+    # ivar is the inverse variance 1 / ye ** 2, which is cheaper to apply than 1 / ye
+    r = y - ym
+    return r * r * ivar
+
+
+def _sum_z_squared(y, ivar, ym):
+    return np.sum(_z_squared(y, ivar, ym))
 
 
 def _soft_l1_loss(z_sqr):
-    return np.sum(2 * (np.sqrt(1 + z_sqr) - 1))
+    return 2 * np.sum(np.sqrt(1 + z_sqr) - 1)
 
 
-def _soft_l1_cost(y, ye, ym):
-    return _soft_l1_loss(_z_squared(y, ye, ym))
+def _soft_l1_cost(y, ivar, ym):
+    return _soft_l1_loss(_z_squared(y, ivar, ym))
 
 
 def _replace_none(x, replacement):
@@ -171,7 +188,8 @@ def chi2(y: _ArrayLike[float], ye: _ArrayLike[float], ym: _ArrayLike[float]) ->
         Const function value.
     """
     y, ye, ym = np.atleast_1d(y, ye, ym)
-    return np.sum(_z_squared(y, ye, ym))
+    z = (y - ym) / ye
+    return np.sum(z * z)
 
 
 def multinominal_chi2(n: _ArrayLike[float], mu: _ArrayLike[float]) -> float:
@@ -229,6 +247,16 @@ def poisson_chi2(n: _ArrayLike[float], mu: _ArrayLike[float]) -> float:
     return 2 * np.sum(mu - n + n * (_safe_log(n) - _safe_log(mu)))
 
 
+# The following two functions compute the cost for Bohm-Zech transformed data, where n
+# are the scaled observed counts and s are the scale factors that are applied to mu.
+def _multinominal_chi2_scaled(n, mu, s):
+    return multinominal_chi2(n, mu * s)
+
+
+def _poisson_chi2_scaled(n, mu, s):
+    return poisson_chi2(n, mu * s)
+
+
 def template_chi2_jsc(
     n: _ArrayLike[float], mu: _ArrayLike[float], mu_var: _ArrayLike[float]
 ) -> float:
@@ -346,25 +374,92 @@ def template_nll_asy(
 
 # If numba is available, use it to accelerate computations in float32 and float64
 # precision. Fall back to plain numpy for float128 which is not currently supported
-# by numba.
+# by numba. The numba kernels are explicit loops which compute each sum in a single
+# pass over the inputs without allocating temporary arrays.
 try:
-    from numba import njit as _njit
+    from numba import njit as _njit, prange as _prange, config as _numba_config
     from numba.extending import overload as _overload
 
-    @_overload(_safe_log, inline="always")
+    @_overload(_safe_log)
     def _ol_safe_log(x):
-        return _safe_log  # pragma: no cover
+        # The kernels call this on scalars. Replacing zero with a select is cheaper than
+        # adding an offset to every value. NaN and negative values still give NaN.
+        def impl(x):  # pragma: no cover
+            return np.log(x if x != 0 else 1e-323)
 
-    @_overload(_z_squared, inline="always")
-    def _ol_z_squared(y, ye, ym):
-        return _z_squared  # pragma: no cover
+        return impl
 
-    _unbinned_nll_np = _unbinned_nll
-    _unbinned_nll_nb = _njit(
+    # Reassociation lets LLVM split each sum into independent partial sums and
+    # vectorize the loop. We do not enable the full fastmath set, which would also
+    # allow the compiler to assume that there are no NaN or infinite values.
+    _njit_options = dict(
         nogil=True,
         cache=True,
         error_model="numpy",
-    )(_unbinned_nll_np)
+        fastmath={"reassoc", "contract"},
+        boundscheck=False,
+    )
+
+    # Inputs larger than this are processed by the parallel version of a kernel. For
+    # smaller inputs, the overhead of launching the threads is not worth it. The parallel
+    # versions are only used if the user selected the TBB threading layer, which is safe
+    # to use from several threads and after fork. The other threading layers can abort
+    # the process in these situations, which worked fine with the serial kernels.
+    _parallel_threshold = (
+        50_000
+        if _numba_config.NUMBA_NUM_THREADS > 1
+        and str(_numba_config.THREADING_LAYER).lower() in ("tbb", "safe")
+        else np.inf
+    )
+    # Guards calls to parallel kernels, in case they are enabled with a threading layer
+    # that does not support concurrent calls from several threads.
+    _parallel_lock = threading.Lock()
+
+    def _ravel(*args):
+        # kernels loop over 1D arrays of equal length
+        if any(a.shape != args[0].shape for a in args):
+            # broadcast_to returns read-only views, which numba accepts without warning
+            shape = np.broadcast(*args).shape
+            args = [np.broadcast_to(a, shape) for a in args]
+        return [a if a.ndim == 1 else a.ravel() for a in args]
+
+    def _kernel(fn):
+        # compile a serial and a parallel version of fn and select one at call time
+        serial = _njit(**_njit_options)(fn)
+        # Numba keys its on-disk cache by the qualified name and the line number of the
+        # Python function, but not by the parallel flag. The parallel version is
+        # compiled from a copy with a distinct name, so that the two versions do not
+        # load each other's machine code from the cache.
+        fn_parallel = FunctionType(
+            fn.__code__, fn.__globals__, fn.__name__, fn.__defaults__, fn.__closure__
+        )
+        fn_parallel.__qualname__ = fn.__qualname__ + "_parallel"
+        parallel = _njit(parallel=True, **_njit_options)(fn_parallel)
+
+        def kernel(*args):
+            # The kernel is called once per cost function evaluation, so its overhead
+            # matters for small inputs. The common case of 1D arrays of equal shape is
+            # checked with a plain loop, which is faster than calling _ravel.
+            shape = args[0].shape
+            for a in args:
+                if a.shape != shape or len(shape) != 1:
+                    args = _ravel(*args)
+                    break
+            if len(args[0]) > _parallel_threshold:
+                with _parallel_lock:
+                    return parallel(*args)
+            return serial(*args)
+
+        return kernel
+
+    @_kernel
+    def _unbinned_nll_nb(x):
+        r = 0.0
+        for i in _prange(len(x)):
+            r += _safe_log(x[i])
+        return -r
+
+    _unbinned_nll_np = _unbinned_nll
 
     def _unbinned_nll(x):
         if x.dtype in (np.float32, np.float64):
@@ -372,12 +467,29 @@ try:
         # fallback to numpy for float128
         return _unbinned_nll_np(x)
 
+    @_kernel
+    def _unbinned_nll_log_nb(logx):
+        r = 0.0
+        for i in _prange(len(logx)):
+            r += logx[i]
+        return -r
+
+    _unbinned_nll_log_np = _unbinned_nll_log
+
+    def _unbinned_nll_log(logx):
+        if logx.dtype in (np.float32, np.float64):
+            return _unbinned_nll_log_nb(logx)
+        # fallback to numpy for float128
+        return _unbinned_nll_log_np(logx)
+
+    @_kernel
+    def _multinominal_chi2_nb(n, mu):
+        r = 0.0
+        for i in _prange(len(n)):
+            r += n[i] * (_safe_log(n[i]) - _safe_log(mu[i]))
+        return 2 * r
+
     _multinominal_chi2_np = multinominal_chi2
-    _multinominal_chi2_nb = _njit(
-        nogil=True,
-        cache=True,
-        error_model="numpy",
-    )(_multinominal_chi2_np)
 
     def multinominal_chi2(n: _ArrayLike[float], mu: _ArrayLike[float]) -> float:  # noqa
         n, mu = np.atleast_1d(n, mu)  # type:ignore
@@ -388,12 +500,14 @@ try:
 
     multinominal_chi2.__doc__ = _multinominal_chi2_np.__doc__
 
+    @_kernel
+    def _poisson_chi2_nb(n, mu):
+        r = 0.0
+        for i in _prange(len(n)):
+            r += mu[i] - n[i] + n[i] * (_safe_log(n[i]) - _safe_log(mu[i]))
+        return 2 * r
+
     _poisson_chi2_np = poisson_chi2
-    _poisson_chi2_nb = _njit(
-        nogil=True,
-        cache=True,
-        error_model="numpy",
-    )(_poisson_chi2_np)
 
     def poisson_chi2(n: _ArrayLike[float], mu: _ArrayLike[float]) -> float:  # noqa
         n, mu = np.atleast_1d(n, mu)  # type:ignore
@@ -404,12 +518,50 @@ try:
 
     poisson_chi2.__doc__ = _poisson_chi2_np.__doc__
 
+    # The scaled variants apply the Bohm-Zech scale factors inside the loop, which
+    # avoids a temporary array for the scaled prediction.
+    @_kernel
+    def _multinominal_chi2_scaled_nb(n, mu, s):
+        r = 0.0
+        for i in _prange(len(n)):
+            r += n[i] * (_safe_log(n[i]) - _safe_log(mu[i] * s[i]))
+        return 2 * r
+
+    _multinominal_chi2_scaled_np = _multinominal_chi2_scaled
+
+    def _multinominal_chi2_scaled(n, mu, s):
+        # n and s come from the data and may have a wider type than mu
+        if np.result_type(n, mu, s) in (np.float32, np.float64):
+            return _multinominal_chi2_scaled_nb(n, mu, s)
+        # fallback to numpy for float128
+        return _multinominal_chi2_scaled_np(n, mu, s)
+
+    @_kernel
+    def _poisson_chi2_scaled_nb(n, mu, s):
+        r = 0.0
+        for i in _prange(len(n)):
+            m = mu[i] * s[i]
+            r += m - n[i] + n[i] * (_safe_log(n[i]) - _safe_log(m))
+        return 2 * r
+
+    _poisson_chi2_scaled_np = _poisson_chi2_scaled
+
+    def _poisson_chi2_scaled(n, mu, s):
+        # n and s come from the data and may have a wider type than mu
+        if np.result_type(n, mu, s) in (np.float32, np.float64):
+            return _poisson_chi2_scaled_nb(n, mu, s)
+        # fallback to numpy for float128
+        return _poisson_chi2_scaled_np(n, mu, s)
+
+    @_kernel
+    def _chi2_nb(y, ye, ym):
+        r = 0.0
+        for i in _prange(len(y)):
+            z = (y[i] - ym[i]) / ye[i]
+            r += z * z
+        return r
+
     _chi2_np = chi2
-    _chi2_nb = _njit(
-        nogil=True,
-        cache=True,
-        error_model="numpy",
-    )(_chi2_np)
 
     def chi2(
         y: _ArrayLike[float], ye: _ArrayLike[float], ym: _ArrayLike[float]
@@ -422,12 +574,41 @@ try:
 
     chi2.__doc__ = _chi2_np.__doc__
 
+    @_kernel
+    def _sum_z_squared_nb(y, ivar, ym):
+        r = 0.0
+        for i in _prange(len(y)):
+            z = y[i] - ym[i]
+            r += z * z * ivar[i]
+        return r
+
+    _sum_z_squared_np = _sum_z_squared
+
+    @_kernel
+    def _sum_squared_nb(y, ym):
+        r = 0.0
+        for i in _prange(len(y)):
+            z = y[i] - ym[i]
+            r += z * z
+        return r
+
+    def _sum_z_squared(y, ivar, ym):
+        if ym.dtype in (np.float32, np.float64):
+            if np.ndim(ivar) == 0:
+                # common uncertainty for all points
+                return ivar * _sum_squared_nb(y, ym)
+            return _sum_z_squared_nb(y, ivar, ym)
+        # fallback to numpy for float128
+        return _sum_z_squared_np(y, ivar, ym)
+
+    @_kernel
+    def _soft_l1_loss_nb(z_sqr):
+        r = 0.0
+        for i in _prange(len(z_sqr)):
+            r += np.sqrt(1 + z_sqr[i]) - 1
+        return 2 * r
+
     _soft_l1_loss_np = _soft_l1_loss
-    _soft_l1_loss_nb = _njit(
-        nogil=True,
-        cache=True,
-        error_model="numpy",
-    )(_soft_l1_loss_np)
 
     def _soft_l1_loss(z_sqr):
         if z_sqr.dtype in (np.float32, np.float64):
@@ -435,22 +616,21 @@ try:
         # fallback to numpy for float128
         return _soft_l1_loss_np(z_sqr)
 
-    @_overload(_soft_l1_loss, inline="always")
-    def _ol_soft_l1_loss(z_sqr):
-        return _soft_l1_loss_np  # pragma: no cover
+    @_kernel
+    def _soft_l1_cost_nb(y, ivar, ym):
+        r = 0.0
+        for i in _prange(len(y)):
+            z = y[i] - ym[i]
+            r += np.sqrt(1 + z * z * ivar[i]) - 1
+        return 2 * r
 
     _soft_l1_cost_np = _soft_l1_cost
-    _soft_l1_cost_nb = _njit(
-        nogil=True,
-        cache=True,
-        error_model="numpy",
-    )(_soft_l1_cost_np)
 
-    def _soft_l1_cost(y, ye, ym):
+    def _soft_l1_cost(y, ivar, ym):
         if ym.dtype in (np.float32, np.float64):
-            return _soft_l1_cost_nb(y, ye, ym)
+            return _soft_l1_cost_nb(y, ivar, ym)
         # fallback to numpy for float128
-        return _soft_l1_cost_np(y, ye, ym)
+        return _soft_l1_cost_np(y, ivar, ym)
 
 except ModuleNotFoundError:
     pass
@@ -554,7 +734,7 @@ class Cost(abc.ABC):
         float
         """
         r = self._call(args)
-        if self.verbose >= 1:
+        if self._verbose >= 1:
             print(args, "->", r)
         return r
 
@@ -581,6 +761,16 @@ class Constant(Cost):
         return self.value
 
 
+def _arg_getter(cmap):
+    # itemgetter is implemented in C and faster than building a tuple with a generator
+    # expression; for zero or one index, it cannot return a tuple, so we use a slice
+    if len(cmap) > 1:
+        return itemgetter(*cmap)
+    if cmap:
+        return itemgetter(slice(cmap[0], cmap[0] + 1))
+    return itemgetter(slice(0, 0))
+
+
 class CostSum(Cost, Sequence):
     """Sum of cost functions.
 
@@ -606,7 +796,7 @@ class CostSum(Cost, Sequence):
     the function and which parameters overlap between different cost functions.
     """
 
-    __slots__ = "_items", "_maps"
+    __slots__ = "_items", "_getters"
 
     def __init__(self, *items):
         """Initialize with cost functions.
@@ -625,18 +815,18 @@ class CostSum(Cost, Sequence):
                     self._items.append(Constant(item))
             else:
                 self._items.append(item)
-        args, self._maps = merge_signatures(self._items)
+        args, maps = merge_signatures(self._items)
+        self._getters = [_arg_getter(m) for m in maps]
         super().__init__(args, max(c.verbose for c in self._items))
 
     def _split(self, args):
-        for component, cmap in zip(self._items, self._maps):
-            component_args = tuple(args[i] for i in cmap)
-            yield component, component_args
+        for component, getter in zip(self._items, self._getters):
+            yield component, getter(args)
 
     def _call(self, args):
         r = 0.0
-        for comp, cargs in self._split(args):
-            r += comp._call(cargs) / comp.errordef
+        for comp, getter in zip(self._items, self._getters):
+            r += comp._call(getter(args)) / comp.errordef
         return r
 
     def _ndata(self):
@@ -863,7 +1053,7 @@ class UnbinnedNLL(UnbinnedCost):
         x = self._model(data, *args)
         x = _normalize_model_output(x)
         if self._log:
-            return -2.0 * np.sum(x)
+            return 2.0 * _unbinned_nll_log(x)
         return 2.0 * _unbinned_nll(x)
 
 
@@ -945,7 +1135,7 @@ class ExtendedUnbinnedNLL(UnbinnedCost):
             x, "Model should return numpy array in second position"
         )
         if self._log:
-            return 2 * (ns - np.sum(x))
+            return 2 * (ns + _unbinned_nll_log(x))
         return 2 * (ns + _unbinned_nll(x))
 
 
@@ -1068,9 +1258,8 @@ class BinnedCostWithModel(BinnedCost):
         for i in range(self._ndim):
             d = np.diff(d, axis=i)
         # differences can come out negative due to round-off error in subtraction,
-        # we set negative values to zero
-        d[d < 0] = 0
-        return d
+        # we set negative values to zero; np.maximum keeps NaN like the comparison did
+        return np.maximum(d, 0, out=d)
 
 
 class Template(BinnedCost):
@@ -1187,13 +1376,16 @@ class Template(BinnedCost):
                 temp.append(t)
                 temp_var.append(t)
 
-        nt = []
-        nt_var = []
-        for t, tv in zip(temp, temp_var):
+        # normalized templates are stored as rows of a matrix, so that the prediction
+        # is computed with one matrix-vector product per call
+        dtype = np.result_type(float, *temp, *temp_var)
+        nt = np.empty((M, np.prod(shape, dtype=int)), dtype=dtype)
+        nt_var = np.empty_like(nt)
+        for i, (t, tv) in enumerate(zip(temp, temp_var)):
             f = 1 / np.sum(t)
-            nt.append(t * f)
-            nt_var.append(tv * f**2)
-        self._bbl_data = (nt, nt_var)
+            nt[i] = (t * f).ravel()
+            nt_var[i] = (tv * f**2).ravel()
+        self._bbl_data = (nt, nt_var, shape)
 
         known_methods = {
             "jsc": template_chi2_jsc,
@@ -1218,12 +1410,10 @@ class Template(BinnedCost):
         super().__init__(name, n, xe, verbose)
 
     def _pred(self, args: _tp.Sequence[float]):
-        ntemp, ntemp_var = self._bbl_data
-        mu = 0
-        mu_var = 0
-        for a, nt, vnt in zip(args, ntemp, ntemp_var):
-            mu += a * nt
-            mu_var += a**2 * vnt
+        ntemp, ntemp_var, shape = self._bbl_data
+        a = np.asarray(args)
+        mu = np.dot(a, ntemp).reshape(shape)
+        mu_var = np.dot(a * a, ntemp_var).reshape(shape)
         return mu, mu_var
 
     def _call(self, args):
@@ -1290,7 +1480,7 @@ class BinnedNLL(BinnedCostWithModel):
     using the saturated model as a reference.
     """
 
-    __slots__ = ()
+    __slots__ = "_ntotal"
 
     @property
     def cdf(self):
@@ -1326,24 +1516,35 @@ class BinnedNLL(BinnedCostWithModel):
         """
         super().__init__(n, xe, cdf, verbose)
 
+    def _update_cache(self):
+        super()._update_cache()
+        # total count of the masked histogram, which only changes with data or mask
+        self._ntotal = np.sum(self._masked[..., 0] if self._bztrafo else self._masked)
+
     def _pred(self, args):
         p = super()._pred(args)
         ma = self.mask
         if ma is not None:
             p /= np.sum(p[ma])  # normalise probability of remaining bins
-        scale = np.sum(self._masked[..., 0] if self._bztrafo else self._masked)
-        return p * scale
+        return p * self._ntotal
 
     def _call(self, args):
-        mu = self._pred(args)
+        # mu is a new array, so we can scale it in place unless the model returns
+        # integers; then we convert to float first
+        mu = super()._pred(args)
+        if mu.dtype.kind != "f":
+            mu = mu.astype(float)
         ma = self.mask
-        if ma is not None:
+        if ma is None:
+            mu *= self._ntotal
+        else:
+            # select the remaining bins once and normalise their probability
             mu = mu[ma]
+            mu *= self._ntotal / np.sum(mu)
         if self._bztrafo:
-            n, mu = self._bztrafo(mu)
-        else:
-            n = self._masked
-        return multinominal_chi2(n, mu)
+            bz = self._bztrafo
+            return _multinominal_chi2_scaled(bz._obs, mu, bz._scale)
+        return multinominal_chi2(self._masked, mu)
 
 
 class ExtendedBinnedNLL(BinnedCostWithModel):
@@ -1408,10 +1609,9 @@ class ExtendedBinnedNLL(BinnedCostWithModel):
         if ma is not None:
             mu = mu[ma]
         if self._bztrafo:
-            n, mu = self._bztrafo(mu)
-        else:
-            n = self._masked
-        return poisson_chi2(n, mu)
+            bz = self._bztrafo
+            return _poisson_chi2_scaled(bz._obs, mu, bz._scale)
+        return poisson_chi2(self._masked, mu)
 
 
 class LeastSquares(MaskedCost):
@@ -1422,7 +1622,7 @@ class LeastSquares(MaskedCost):
     :meth:`__init__` for details on how to use a multivariate model.
     """
 
-    __slots__ = "_loss", "_cost", "_model", "_ndim"
+    __slots__ = "_loss", "_cost", "_model", "_ndim", "_ivar"
 
     @property
     def x(self):
@@ -1474,15 +1674,15 @@ class LeastSquares(MaskedCost):
         self._loss = loss
         if isinstance(loss, str):
             if loss == "linear":
-                self._cost = chi2
+                self._cost = _sum_z_squared
             elif loss == "soft_l1":
                 self._cost = _soft_l1_cost
             else:
                 raise ValueError("unknown loss type: " + loss)
         else:
             assert hasattr(loss, "__call__")
-            self._cost = lambda y, ye, ym: np.sum(
-                loss(_z_squared(y, ye, ym))  # type:ignore
+            self._cost = lambda y, ivar, ym: np.sum(
+                loss(_z_squared(y, ivar, ym))  # type:ignore
             )
 
     def __init__(
@@ -1543,16 +1743,30 @@ class LeastSquares(MaskedCost):
         self.loss = loss
 
         x = np.atleast_2d(x)
-        data = np.column_stack(np.broadcast_arrays(*x, y, yerror))
+        # column-major layout makes each of x, y, yerror a contiguous array
+        data = np.asfortranarray(np.column_stack(np.broadcast_arrays(*x, y, yerror)))
 
         super().__init__(describe(self._model)[1:], data, verbose)
 
+    def _update_cache(self):
+        super()._update_cache()
+        # masking with an index array returns a row-major copy, so we restore the
+        # column-major layout to pass a contiguous x to the model
+        self._masked = np.asfortranarray(self._masked)
+        # yerror is constant during the fit, so we compute the inverse variance only
+        # when data or mask change and avoid a division per point in every call; if
+        # all points have the same uncertainty, the inverse variance is a scalar
+        ye = self._masked[:, self._ndim + 1]
+        if len(ye) > 0 and np.all(ye == ye[0]):
+            ye = ye[0]
+        self._ivar = ye**-2
+
     def _call(self, args):
         x = self._masked.T[0] if self._ndim == 1 else self._masked.T[: self._ndim]
-        y, yerror = self._masked.T[self._ndim :]
+        y = self._masked[:, self._ndim]
         ym = self._model(x, *args)
         ym = _normalize_model_output(ym)
-        return self._cost(y, yerror, ym)
+        return self._cost(y, self._ivar, ym)
 
     def _ndata(self):
         return len(self._masked)
@@ -1670,10 +1884,12 @@ class NormalConstraint(Cost):
         self._value[:] = value
 
     def _call(self, args):
-        delta = self._value - args
+        # args is a tuple, explicit conversion to an array is faster than letting the
+        # ufunc do it; np.dot and matmul also have less call overhead than einsum
+        delta = self._value - np.asarray(args)
         if self._covinv.ndim < 2:
-            return np.sum(delta**2 * self._covinv)
-        return np.einsum("i,ij,j", delta, self._covinv, delta)
+            return np.dot(delta * delta, self._covinv)
+        return np.dot(delta, self._covinv @ delta)
 
     def _ndata(self):
         return len(self._value)
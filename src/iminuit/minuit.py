@@ -1462,7 +1462,7 @@ class Minuit:
             symmetrically around the minimum (Default: 2). Ignored if grid is set.
         grid : array-like, optional
             Parameter values on which to compute the profile. If grid is set, size and
-            bound are ignored.
+            bound are ignored. A float array is used as is and not copied.
         subtract_min : bool, optional
             If true, subtract offset so that smallest value is zero (Default: False).
 
@@ -1479,7 +1479,7 @@ class Minuit:
             raise ValueError("Unknown parameter %s" % vname)
 
         if grid is not None:
-            x = np.array(grid, dtype=float)
+            x = np.asarray(grid, dtype=float)
             if x.ndim != 1:
                 raise ValueError("grid must be 1D array-like")
         else:
@@ -1504,7 +1504,7 @@ class Minuit:
             y[i] = fm.fval
 
         if subtract_min:
-            y -= np.min(y)
+            y -= np.nanmin(y)
 
         return x, y, status
 
@@ -1568,7 +1568,7 @@ class Minuit:
             symmetrically around the minimum (Default: 2). Ignored if grid is set.
         grid : array-like, optional
             Parameter values on which to compute the profile. If grid is set, size and
-            bound are ignored.
+            bound are ignored. A float array is used as is and not copied.
         subtract_min : bool, optional
             If true, subtract offset so that smallest value is zero (Default: False).
 
@@ -1584,7 +1584,7 @@ class Minuit:
         mnprofile
         """
         if grid is not None:
-            x = np.array(grid, dtype=float)
+            x = np.asarray(grid, dtype=float)
             if x.ndim != 1:
                 raise ValueError("grid must be 1D array-like")
         else:
@@ -1599,7 +1599,7 @@ class Minuit:
             y[i] = self.fcn(values)
 
         if subtract_min:
-            y -= np.min(y)
+            y -= np.nanmin(y)
 
         return x, y
 
@@ -1645,22 +1645,22 @@ class Minuit:
         vmin = None
         vmax = None
         if vname in self.merrors:
-            vmin = v + self.merrors[vname].lower
-            vmax = v + self.merrors[vname].upper
+            me = self.merrors[vname]
+            vmin = v + me.lower
+            vmax = v + me.upper
         else:
-            vmin = v - self.errors[vname]
-            vmax = v + self.errors[vname]
+            e = self.errors[vname]
+            vmin = v - e
+            vmax = v + e
 
         if vmin is not None and band:
             plt.axvspan(vmin, vmax, facecolor="0.8")
 
         if text:
             plt.title(
-                (f"{vname} = {v:.3g}")
+                f"{vname} = {v:.3g}"
                 if vmin is None
-                else (
-                    "{} = {:.3g} - {:.3g} + {:.3g}".format(vname, v, v - vmin, vmax - v)
-                ),
+                else f"{vname} = {v:.3g} - {v - vmin:.3g} + {vmax - v:.3g}",
                 fontsize="large",
             )
 
@@ -1706,6 +1706,7 @@ class Minuit:
             (Default: 2). Ignored if grid is set.
         grid : tuple of array-like, optional
             Grid points to scan over. If grid is set, size and bound are ignored.
+            Float arrays are used as is and not copied.
         subtract_min :
             Subtract minimum from return values (Default: False).
 
@@ -1724,8 +1725,8 @@ class Minuit:
         """
         if grid is not None:
             xg, yg = grid
-            xv = np.array(xg, dtype=float)
-            yv = np.array(yg, dtype=float)
+            xv = np.asarray(xg, dtype=float)
+            yv = np.asarray(yg, dtype=float)
             if xv.ndim != 1 or yv.ndim != 1:
                 raise ValueError("grid per parameter must be 1D array-like")
         else:
@@ -1756,7 +1757,7 @@ class Minuit:
                 zv[i, j] = self._fcn(values)
 
         if subtract_min:
-            zv -= np.min(zv)
+            zv -= np.nanmin(zv)
 
         return xv, yv, zv
 
@@ -1782,7 +1783,7 @@ class Minuit:
             kwargs["subtract_min"] = True
         vx, vy, vz = self.contour(x, y, **kwargs)
 
-        v = [self.errordef * (i + 1) for i in range(4)]
+        v = self.errordef * np.arange(1, 5)
 
         CS = plt.contour(vx, vy, vz.T, v)
         plt.clabel(CS, v)
@@ -1927,19 +1928,20 @@ class Minuit:
 
         cls = [mutil._replace_none(x, 0.68) for x in mutil._iterate(cl)]
 
-        c_val = []
         c_pts = []
         codes = []
         for cl in cls:
+            # pts is an array which already repeats the first point at the end
             pts = self.mncontour(x, y, cl=cl, size=size, interpolated=interpolated)
-            n_lineto = len(pts) - 2
+            n = len(pts)
             if mpl_version < (3, 5):
-                n_lineto -= 1  # pragma: no cover
-            c_val.append(cl)
+                n -= 1  # pragma: no cover
+            k = np.full(n, Path.LINETO, dtype=Path.code_type)
+            k[0] = Path.MOVETO
+            k[-1] = Path.CLOSEPOLY
             c_pts.append([pts])  # level can have more than one contour in mpl
-            codes.append([[Path.MOVETO] + [Path.LINETO] * n_lineto + [Path.CLOSEPOLY]])
-        assert len(c_val) == len(codes), f"{len(c_val)} {len(codes)}"
-        cs = ContourSet(plt.gca(), c_val, c_pts, codes)
+            codes.append([k])
+        cs = ContourSet(plt.gca(), cls, c_pts, codes)
         plt.clabel(cs)
         plt.xlabel(x)
         plt.ylabel(y)
@@ -162,13 +162,8 @@ def _strip(items: List[str]) -> List[str]:
     # ignore inf and nan
     mask = tuple(i for (i, s) in enumerate(items) if "." in s)
     if mask:
-        # strip common trailing "0"s
-        first = items[mask[0]]
-        for i in range(len(first)):
-            if all(items[k][-1 - i] == "0" for k in mask):
-                i += 1
-            else:
-                break
+        # strip common trailing "0"s; rstrip stops at the ".", so this is safe
+        i = min(len(items[k]) - len(items[k].rstrip("0")) for k in mask)
         # maybe strip common trailing "." after stripping "0"s
         if i > 0 and all(items[k][-1 - i] == "." for k in mask):
             i += 1
@@ -180,7 +175,7 @@ def _strip(items: List[str]) -> List[str]:
 
 def _find_smallest_nonzero_abs_value(seq):
     k = None
-    xmin = float("infinity")
+    xmin = math.inf
     for i, x in enumerate(seq):
         x = abs(x)
         if x > 0 and x < xmin:
@@ -242,7 +237,7 @@ def _round(values, leader, n_exp_extern):
             lerror = abs(values[leader])
 
     def fmt(x, n_digits):
-        return ("%%.%if" % max(n_digits, 0)) % x
+        return "%.*f" % (max(n_digits, 0), x)
 
     n_exp = None
     if math.isfinite(lerror) and lerror > 0:
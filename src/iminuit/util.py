@@ -4,7 +4,10 @@ Data classes and utilities used by :class:`iminuit.Minuit`.
 You can look up the interface of data classes that iminuit uses here.
 """
 import inspect
-from collections import OrderedDict
+import re
+import types
+from itertools import islice
+from operator import attrgetter
 from argparse import Namespace
 from . import _repr_html, _repr_text, _deprecated
 from . import typing as _mtp
@@ -84,17 +87,31 @@ class BasicView(abc.ABC):
         self._minuit._copy_state_if_needed()
         index = _key2index(self._minuit._var2pos, key)
         if isinstance(index, list):
-            if _ndim(value) == self._ndim:  # support basic broadcasting
-                for i in index:
-                    self._set(i, value)
+            if isinstance(value, np.ndarray):
+                # convert to Python objects once instead of element by element
+                nd = value.ndim
+                value = value.tolist()
+            else:
+                nd = _ndim(value)
+            if nd == self._ndim:  # support basic broadcasting
+                self._set_many(index, [value] * len(index))
             else:
                 if len(value) != len(index):
                     raise ValueError("length of argument does not match slice")
-                for i, v in zip(index, value):
-                    self._set(i, v)
+                self._set_many(index, value)
         else:
             self._set(index, value)
 
+    def _set_many(self, index: _tp.List[int], values: _tp.Iterable) -> None:
+        # derived classes may override this to set all values in one call
+        for i, v in zip(index, values):
+            self._set(i, v)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """Return values as a new array."""
+        # iterating calls _get directly, which is faster than numpy's use of __getitem__
+        return np.array(tuple(self), dtype=dtype)
+
     def __eq__(self, other: object) -> bool:
         """Return true if all values are equal."""
         a, b = np.broadcast_arrays(self, other)  # type:ignore
@@ -114,6 +131,11 @@ class BasicView(abc.ABC):
 
 
 def _ndim(obj: _tp.Iterable) -> int:
+    # fast paths for common types, the isinstance check with Iterable is slow
+    if obj is None or isinstance(obj, (int, float)):
+        return 0
+    if isinstance(obj, np.ndarray):
+        return obj.ndim
     nd = 0
     while isinstance(obj, _tp.Iterable):
         nd += 1
@@ -135,6 +157,13 @@ class ValueView(BasicView):
     def _set(self, i: int, value: float) -> None:
         self._minuit._last_state.set_value(i, value)
 
+    def _set_many(self, index: _tp.List[int], values: _tp.Iterable) -> None:
+        self._minuit._last_state.set_values(index, values)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """Return values as a new array, which is fetched in one call."""
+        return np.asarray(self._minuit._last_state.values, dtype=dtype)
+
 
 class ErrorView(BasicView):
     """Array-like view of parameter errors."""
@@ -151,6 +180,10 @@ class ErrorView(BasicView):
             value = _guess_initial_step(value)
         self._minuit._last_state.set_error(i, value)
 
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """Return errors as a new array, which is fetched in one call."""
+        return np.asarray(self._minuit._last_state.errors, dtype=dtype)
+
 
 class FixedView(BasicView):
     """Array-like view of whether parameters are fixed."""
@@ -230,7 +263,7 @@ class Matrix(np.ndarray):
     names.
     """
 
-    __slots__ = ("_var2pos",)
+    __slots__ = ("_var2pos", "_names", "_fmt_cache")
 
     def __new__(cls, parameters: _tp.Union[_tp.Dict, _tp.Tuple]) -> _tp.Any:
         """Not to be initialized by users."""
@@ -243,14 +276,19 @@ class Matrix(np.ndarray):
         n = len(parameters)
         obj = super().__new__(cls, (n, n))
         obj._var2pos = var2pos
+        obj._names = tuple(var2pos)
+        obj._fmt_cache = None
         return obj
 
     def __array_finalize__(self, obj: _tp.Any) -> None:
         """For internal use."""
         if obj is None:
             self._var2pos: _tp.Dict[str, int] = {}
+            self._names: _tp.Tuple[str, ...] = ()
         else:
             self._var2pos = getattr(obj, "_var2pos", {})
+            self._names = getattr(obj, "_names", ())
+        self._fmt_cache: _tp.Optional[_tp.Tuple[bytes, _tp.List[str]]] = None
 
     def __getitem__(  # type:ignore # mypy complains about incompatible signatures
         self,
@@ -296,7 +334,7 @@ class Matrix(np.ndarray):
 
         Since the matrix is symmetric, the dict only contains the upper triangular matrix.
         """
-        names = tuple(self._var2pos)
+        names = self._names
         d = {}
         for i, pi in enumerate(names):
             for j in range(i, len(names)):
@@ -322,14 +360,23 @@ class Matrix(np.ndarray):
         x     1   -0
         y    -0    4
         """
-        names = tuple(self._var2pos)  # type:ignore
-        nums = _repr_text.matrix_format(self.flatten())  # type:ignore
-        tab = []
+        names = self._names
+        nums = self._matrix_format()
         n = len(self)
-        for i, name in enumerate(names):
-            tab.append([name] + [nums[n * i + j] for j in range(n)])
+        tab = [[name] + nums[n * i : n * (i + 1)] for i, name in enumerate(names)]
         return tab, names
 
+    def _matrix_format(self) -> _tp.List[str]:
+        # Formatting is slow, so we cache the result for repeated display. The matrix
+        # can be modified in place in many ways, so we compare the raw data instead of
+        # trying to track all writes.
+        key = self.tobytes()
+        cache = self._fmt_cache
+        if cache is None or cache[0] != key:
+            cache = (key, _repr_text.matrix_format(self.flatten()))
+            self._fmt_cache = cache
+        return cache[1]
+
     def correlation(self):
         """
         Compute and return correlation matrix.
@@ -339,7 +386,11 @@ class Matrix(np.ndarray):
         """
         a = self.copy()
         d = np.diag(a) ** 0.5
-        a /= np.outer(d, d) + 1e-100
+        # rows and columns of fixed parameters are zero, they stay zero
+        d[d == 0] = 1
+        # scale rows and columns in place, which avoids temporary n x n arrays
+        a /= d[:, np.newaxis]
+        a /= d
         return a
 
     def __repr__(self):
@@ -370,6 +421,8 @@ class Matrix(np.ndarray):
     def __setstate__(self, state):
         """Restore from pickled state."""
         state, self._var2pos = state
+        self._names = tuple(self._var2pos)
+        self._fmt_cache = None
         super().__setstate__(state)
 
 
@@ -428,7 +481,9 @@ class FMin:
             lb = mp.lower_limit if mp.has_lower_limit else -np.inf
             ub = mp.upper_limit if mp.has_upper_limit else np.inf
             # the 0.5 error threshold is somewhat arbitrary
-            self._has_parameters_at_limit |= min(v - lb, ub - v) < 0.5 * e
+            if min(v - lb, ub - v) < 0.5 * e:
+                self._has_parameters_at_limit = True
+                break
         self._nfcn = nfcn
         self._ngrad = ngrad
         self._ndof = ndof
@@ -640,9 +695,7 @@ class FMin:
     def __repr__(self) -> str:
         """Get detailed text representation."""
         s = "<FMin"
-        for key in sorted(dir(self)):
-            if key.startswith("_"):
-                continue
+        for key in self._repr_keys:
             val = getattr(self, key)
             s += f" {key}={val!r}"
         s += ">"
@@ -662,6 +715,11 @@ class FMin:
             p.text(str(self))
 
 
+FMin._repr_keys = tuple(  # type:ignore
+    sorted(k for (k, v) in vars(FMin).items() if isinstance(v, property))
+)
+
+
 class Param:
     """Data object for a single Parameter."""
 
@@ -677,18 +735,37 @@ class Param:
         "upper_limit",
     )
 
+    _fields = attrgetter(*__slots__)
+
     def __init__(
         self,
-        *args: _tp.Union[int, str, float, _tp.Optional[_tp.Tuple[float, float]], bool],
+        number: int,
+        name: str,
+        value: float,
+        error: float,
+        merror: _tp.Optional[_tp.Tuple[float, float]],
+        is_const: bool,
+        is_fixed: bool,
+        lower_limit: _tp.Optional[float],
+        upper_limit: _tp.Optional[float],
     ):
         """Not to be initialized by users."""
-        assert len(args) == len(self.__slots__)
-        for k, arg in zip(self.__slots__, args):
-            setattr(self, k, arg)
+        # explicit assignments are faster than calling setattr in a loop
+        self.number = number
+        self.name = name
+        self.value = value
+        self.error = error
+        self.merror = merror
+        self.is_const = is_const
+        self.is_fixed = is_fixed
+        self.lower_limit = lower_limit
+        self.upper_limit = upper_limit
 
     def __eq__(self, other: object) -> bool:
         """Return True if all values are equal."""
-        return all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+        if type(self) is not type(other):
+            return False
+        return self._fields(self) == self._fields(other)  # type:ignore
 
     def __repr__(self) -> str:
         """Get detailed text representation."""
@@ -727,7 +804,7 @@ class Param:
 class Params(tuple):
     """Tuple-like holder of parameter data objects."""
 
-    __slots__ = ()
+    # no __slots__, the instance dict holds the lazily built name-to-index map
 
     def _repr_html_(self):
         return _repr_html.params(self)
@@ -789,10 +866,11 @@ class Params(tuple):
     def __getitem__(self, key):
         """Get item at key, which can be an index or a parameter name."""
         if isinstance(key, str):
-            for i, p in enumerate(self):
-                if p.name == key:
-                    break
-            key = i
+            try:
+                name2pos = self._name2pos
+            except AttributeError:
+                name2pos = self._name2pos = {p.name: i for i, p in enumerate(self)}
+            key = name2pos[key]
         return super(Params, self).__getitem__(key)
 
     def __str__(self):
@@ -861,15 +939,49 @@ class MError:
         "min",
     )
 
-    def __init__(self, *args: _tp.Union[int, str, float, bool]):
+    _fields = attrgetter(*__slots__)
+
+    def __init__(
+        self,
+        number: int,
+        name: str,
+        lower: float,
+        upper: float,
+        is_valid: bool,
+        lower_valid: bool,
+        upper_valid: bool,
+        at_lower_limit: bool,
+        at_upper_limit: bool,
+        at_lower_max_fcn: bool,
+        at_upper_max_fcn: bool,
+        lower_new_min: float,
+        upper_new_min: float,
+        nfcn: int,
+        min: float,
+    ):
         """Not to be initialized by users."""
-        assert len(args) == len(self.__slots__)
-        for k, arg in zip(self.__slots__, args):
-            setattr(self, k, arg)
+        # explicit assignments are faster than calling setattr in a loop
+        self.number = number
+        self.name = name
+        self.lower = lower
+        self.upper = upper
+        self.is_valid = is_valid
+        self.lower_valid = lower_valid
+        self.upper_valid = upper_valid
+        self.at_lower_limit = at_lower_limit
+        self.at_upper_limit = at_upper_limit
+        self.at_lower_max_fcn = at_lower_max_fcn
+        self.at_upper_max_fcn = at_upper_max_fcn
+        self.lower_new_min = lower_new_min
+        self.upper_new_min = upper_new_min
+        self.nfcn = nfcn
+        self.min = min
 
     def __eq__(self, other: object) -> bool:
         """Return True if all values are equal."""
-        return all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+        if type(self) is not type(other):
+            return False
+        return self._fields(self) == self._fields(other)  # type:ignore
 
     def __repr__(self) -> str:
         """Get detailed text representation."""
@@ -894,7 +1006,7 @@ class MError:
             p.text(str(self))
 
 
-class MErrors(OrderedDict):
+class MErrors(dict):
     """Dict-like map from parameter name to Minos result object."""
 
     __slots__ = ()
@@ -923,11 +1035,8 @@ class MErrors(OrderedDict):
                 key += len(self)
             if key < 0 or key >= len(self):
                 raise IndexError("index out of range")
-            for i, k in enumerate(self):
-                if i == key:
-                    break
-            key = k
-        return OrderedDict.__getitem__(self, key)
+            key = next(islice(self, key, None))
+        return dict.__getitem__(self, key)
 
 
 def _jacobi(
@@ -1217,6 +1326,21 @@ def _arguments_from_func_code(obj: _tp.Any) -> _tp.List[str]:
 
 
 def _arguments_from_inspect(obj: _tp.Callable) -> _tp.List[str]:
+    # Fast path for plain Python functions, which reads the arguments from the code
+    # object. This gives the same result as inspect.signature, which is much slower.
+    # Decorated functions may override their signature and must use the slow path.
+    if (
+        isinstance(obj, types.FunctionType)
+        and not hasattr(obj, "__wrapped__")
+        and not hasattr(obj, "__signature__")
+    ):
+        co = obj.__code__
+        n = co.co_argcount
+        # keyword-only arguments after *args are skipped, like in the loop below
+        if not co.co_flags & inspect.CO_VARARGS:
+            n += co.co_kwonlyargcount
+        return list(co.co_varnames[:n])
+
     try:
         # fails for builtin on Windows and OSX in Python 3.6
         signature = inspect.signature(obj)
@@ -1235,6 +1359,9 @@ def _arguments_from_inspect(obj: _tp.Callable) -> _tp.List[str]:
     return args
 
 
+_BRACES = re.compile(r"[()]")
+
+
 def _arguments_from_docstring(obj: _tp.Callable) -> _tp.List[str]:
     doc = inspect.getdoc(obj)
 
@@ -1259,15 +1386,15 @@ def _arguments_from_docstring(obj: _tp.Callable) -> _tp.List[str]:
         return []
     start += len(token)
 
+    # find matching closing brace; the regex skips over other characters in C
+    stop = len(doc)
     nbrace = 1
-    for ich, ch in enumerate(doc[start:]):
-        if ch == "(":
-            nbrace += 1
-        elif ch == ")":
-            nbrace -= 1
+    for match in _BRACES.finditer(doc, start):
+        nbrace += 1 if match.group() == "(" else -1
         if nbrace == 0:
+            stop = match.start()
             break
-    items = [x.strip(" []") for x in doc[start : start + ich].split(",")]
+    items = [x.strip(" []") for x in doc[start:stop].split(",")]
 
     if items[0] == "self":
         items = items[1:]
@@ -1330,8 +1457,9 @@ def _key2index(
     var2pos: _tp.Dict[str, int],
     key: _mtp.Key,
 ) -> _tp.Union[int, _tp.List[int]]:
-    import typing as _tp
-
+    # check the common case first, the isinstance check with Iterable is slow
+    if isinstance(key, (int, str)):
+        return _key2index_item(var2pos, key)
     if isinstance(key, slice):
         return _key2index_from_slice(var2pos, key)
     if not isinstance(key, str) and isinstance(key, _tp.Iterable):
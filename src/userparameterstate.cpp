@@ -3,7 +3,9 @@
 #include <Minuit2/MnUserParameterState.h>
 #include <pybind11/operators.h>
 #include <pybind11/pybind11.h>
+#include <stdexcept>
 #include <type_traits>
+#include <vector>
 
 namespace ROOT {
 namespace Minuit2 {
@@ -36,6 +38,17 @@ const MinuitParameter& getitem(const MnUserParameterState& self, int i) {
   return self.Parameter(i);
 }
 
+void set_values(MnUserParameterState& self, const std::vector<unsigned>& indices,
+                const std::vector<double>& values) {
+  if (indices.size() != values.size())
+    throw std::invalid_argument("indices and values must have same length");
+  const unsigned n = static_cast<unsigned>(size(self));
+  for (std::size_t i = 0; i < indices.size(); ++i) {
+    if (indices[i] >= n) throw py::index_error();
+    self.SetValue(indices[i], values[i]);
+  }
+}
+
 auto iter(const MnUserParameterState& self) {
   return py::make_iterator(self.MinuitParameters().begin(),
                            self.MinuitParameters().end());
@@ -79,6 +92,7 @@ void bind_userparameterstate(py::module m) {
       .def("release", py::overload_cast<unsigned>(&MnUserParameterState::Release))
       .def("set_value",
            py::overload_cast<unsigned, double>(&MnUserParameterState::SetValue))
+      .def("set_values", set_values)
       .def("set_error",
            py::overload_cast<unsigned, double>(&MnUserParameterState::SetError))
       .def("set_limits", py::overload_cast<unsigned, double, double>(
@@ -89,6 +103,8 @@ void bind_userparameterstate(py::module m) {
            py::overload_cast<unsigned, double>(&MnUserParameterState::SetLowerLimit))
       .def("remove_limits",
            py::overload_cast<unsigned>(&MnUserParameterState::RemoveLimits))
+      .def_property_readonly("values", &MnUserParameterState::Params)
+      .def_property_readonly("errors", &MnUserParameterState::Errors)
       .def_property_readonly("fval", &MnUserParameterState::Fval)
       .def_property_readonly("edm", &MnUserParameterState::Edm)
       .def_property_readonly("covariance", &MnUserParameterState::Covariance)
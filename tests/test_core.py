@@ -86,6 +86,15 @@ def test_MnUserParameterState():
 
     assert st2 != st
 
+    st2.set_values([1, 0], [2.5, 1.5])
+    assert st2[0].value == 1.5
+    assert st2[1].value == 2.5
+
+    with pytest.raises(ValueError):
+        st2.set_values([0], [1.0, 2.0])
+    with pytest.raises(IndexError):
+        st2.set_values([2], [1.0])
+
 
 def test_MnMigrad():
     fcn = FCN(fn, None, False, 1)
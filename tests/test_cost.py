@@ -13,7 +13,15 @@ from iminuit.cost import (
     NormalConstraint,
     Template,
     multinominal_chi2,
+    poisson_chi2,
+    chi2,
     _soft_l1_loss,
+    _unbinned_nll,
+    _unbinned_nll_log,
+    _soft_l1_cost,
+    _sum_z_squared,
+    _multinominal_chi2_scaled,
+    _poisson_chi2_scaled,
     PerformanceWarning,
 )
 from typing import Sequence
@@ -409,6 +417,17 @@ def test_BinnedNLL_ndof_zero():
     assert np.isnan(m.fmin.reduced_chi2)
 
 
+def test_BinnedNLL_integer_model():
+    def model(x, a):
+        return np.arange(len(x)) * int(a)
+
+    c = BinnedNLL([1.0, 2.0, 3.0], [0, 1, 2, 3], model)
+    c_ref = BinnedNLL([1.0, 2.0, 3.0], [0, 1, 2, 3], lambda x, a: model(x, a) * 1.0)
+    assert c(1) == pytest.approx(c_ref(1))
+    c.mask = c_ref.mask = [True, False, True]
+    assert c(1) == pytest.approx(c_ref(1))
+
+
 def test_BinnedNLL_bad_input_5():
     with pytest.raises(ValueError):
         BinnedNLL([[1, 2, 3]], [[1, 2], [1, 2, 3]], lambda x, a: 0)
@@ -623,6 +642,16 @@ def test_ExtendedBinnedNLL_mask():
     assert c.ndata == 2
 
 
+def test_ExtendedBinnedNLL_repeated_calls():
+    c = ExtendedBinnedNLL([2, 2, 2], [0, 1, 2, 3], lambda x, a: a * x)
+    assert c(2) == pytest.approx(0)
+    assert c(1) == pytest.approx(poisson_chi2([2, 2, 2], [1, 1, 1]))
+    assert c(2) == pytest.approx(0)
+    # model with float32 output
+    c = ExtendedBinnedNLL([1, 2, 3], [0, 1, 2, 3], lambda x, a: (a * x).astype("f4"))
+    assert c(2) == pytest.approx(poisson_chi2([1, 2, 3], [2, 2, 2]))
+
+
 def test_ExtendedBinnedNLL_properties():
     def cdf(x, a):
         return 0
@@ -760,6 +789,34 @@ def test_LeastSquares_mask_2():
     assert c(1) == pytest.approx(1)
 
 
+@pytest.mark.parametrize("loss", ["linear", "soft_l1", np.arctan])
+def test_LeastSquares_common_yerror(loss):
+    x = np.array([1.0, 2.0, 3.0])
+    y = np.array([2.0, 3.0, 5.0])
+    c = LeastSquares(x, y, 2, line, loss=loss)
+    c_ref = LeastSquares(x, y, [2, 2, 2.0000001], line, loss=loss)
+    assert c(1, 2) == pytest.approx(c_ref(1, 2))
+
+    c.yerror = [1, 2, 3]
+    c_ref.yerror = [1, 2, 3]
+    assert c(1, 2) == c_ref(1, 2)
+
+
+def test_LeastSquares_contiguous():
+    def model(x, a):
+        assert x.flags.c_contiguous
+        return a * x
+
+    c = LeastSquares([1, 2, 3], [2, 4, 6], 1, model)
+    assert c(2) == 0
+    c.mask = [True, False, True]
+    assert c(2) == 0
+    c = LeastSquares(([1, 2], [3, 4]), [4, 6], 1, lambda x, a: a * x[0] + x[1])
+    assert c.x.flags.c_contiguous
+    c.mask = [True, False]
+    assert c(0) == 1
+
+
 def test_LeastSquares_properties():
     def model(x, a):
         return a
@@ -912,6 +969,16 @@ def test_CostSum_4():
     assert_allclose(m1.errors, m2.errors)
 
 
+def test_CostSum_pickle():
+    lsq = LeastSquares([1, 2, 3], [3, 4, 5], 1, line)
+    con = NormalConstraint("b", 1, 1)
+    cs = lsq + con + 1.5
+
+    cs2 = pickle.loads(pickle.dumps(cs))
+    assert cs2(1, 2) == cs(1, 2)
+    assert [cargs for (_, cargs) in cs._split((1, 2))] == [(1, 2), (2,), ()]
+
+
 @pytest.mark.skipif(not matplotlib_available, reason="matplotlib is needed")
 def test_CostSum_visualize():
     lsq = LeastSquares([1, 2, 3], [3, 4, 5], 1, line)
@@ -1028,6 +1095,66 @@ def test_multinominal_chi2():
     assert_allclose(multinominal_chi2(n, one), 0)
 
 
+@pytest.mark.parametrize("parallel", (False, True))
+def test_kernels(monkeypatch, parallel):
+    if parallel:
+        monkeypatch.setattr("iminuit.cost._parallel_threshold", 0, raising=False)
+
+    rng = np.random.default_rng(1)
+    n = rng.poisson(10, size=1000) + 1.0
+    mu = rng.uniform(5, 15, size=1000)
+    ye = rng.uniform(1, 2, size=1000)
+
+    assert poisson_chi2(n, mu) == pytest.approx(
+        2 * np.sum(mu - n + n * (np.log(n) - np.log(mu)))
+    )
+    assert multinominal_chi2(n, mu) == pytest.approx(
+        2 * np.sum(n * (np.log(n) - np.log(mu)))
+    )
+    assert chi2(n, ye, mu) == pytest.approx(np.sum(((n - mu) / ye) ** 2))
+    assert _soft_l1_loss(mu) == pytest.approx(np.sum(2 * (np.sqrt(1 + mu) - 1)))
+    assert _unbinned_nll(mu) == pytest.approx(-np.sum(np.log(mu)))
+    assert _unbinned_nll_log(mu) == pytest.approx(-np.sum(mu))
+    assert _poisson_chi2_scaled(n, mu, ye) == pytest.approx(poisson_chi2(n, mu * ye))
+    assert _multinominal_chi2_scaled(n, mu, ye) == pytest.approx(
+        multinominal_chi2(n, mu * ye)
+    )
+    z2 = ((n - mu) / ye) ** 2
+    assert _sum_z_squared(n, ye**-2, mu) == pytest.approx(np.sum(z2))
+    assert _soft_l1_cost(n, ye**-2, mu) == pytest.approx(
+        np.sum(2 * (np.sqrt(1 + z2) - 1))
+    )
+
+
+def test_kernels_parallel_from_threads(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.setattr("iminuit.cost._parallel_threshold", 0, raising=False)
+
+    x = np.random.default_rng(1).uniform(size=10000)
+    c = UnbinnedNLL(x, lambda x, a: x + a)
+    expected = -2 * np.sum(np.log(x + np.arange(1, 17)[:, np.newaxis]), axis=1)
+
+    with ThreadPoolExecutor(4) as ex:
+        result = list(ex.map(c, range(1, 17)))
+
+    assert_allclose(result, expected)
+
+
+def test_kernels_float32_accuracy():
+    pytest.importorskip("numba")
+
+    rng = np.random.default_rng(1)
+    mu = rng.uniform(5, 15, size=1_000_000).astype(np.float32)
+    n = rng.poisson(mu).astype(np.float32)
+
+    # sums over float32 inputs are accumulated in double precision
+    expected = poisson_chi2(n.astype(np.float64), mu.astype(np.float64))
+    assert poisson_chi2(n, mu) == pytest.approx(expected, rel=1e-9)
+    expected = -np.sum(np.log(mu.astype(np.float64)))
+    assert _unbinned_nll(mu) == pytest.approx(expected, rel=1e-9)
+
+
 @pytest.mark.skipif(
     not hasattr(np, "float128"), reason="float128 not available on all platforms"
 )
@@ -1050,6 +1177,14 @@ def test_model_float128():
 
         Minuit(cost, a=0).migrad()  # should not raise
 
+    # weighted histogram in float128 with float64 model
+    w = np.array([[1, 1]], dtype=np.float128)
+    for cost in (
+        BinnedNLL(w, [1, 2], lambda x, a: a + x),
+        ExtendedBinnedNLL(w, [1, 2], lambda x, a: a + x),
+    ):
+        assert cost(1).dtype == np.float128
+
 
 def test_model_performance_warning():
     def model(x, a):
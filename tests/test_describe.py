@@ -180,3 +180,31 @@ def test_from_bad_docstring_2():
         pass
 
     assert describe(foo) == []
+
+
+def test_keyword_and_positional_only():
+    def f(x, /, y, *, z, **kw):
+        pass
+
+    def g(x, *args, y, **kw):
+        pass
+
+    def h(*, x):
+        pass
+
+    assert describe(f) == ["x", "y", "z"]
+    assert describe(g) == ["x"]
+    assert describe(h) == ["x"]
+
+
+def test_function_with_signature_override():
+    import inspect
+
+    def f(*args):
+        pass
+
+    f.__signature__ = inspect.Signature(
+        [inspect.Parameter(k, inspect.Parameter.POSITIONAL_OR_KEYWORD) for k in "ab"]
+    )
+
+    assert describe(f) == ["a", "b"]
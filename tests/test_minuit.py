@@ -705,7 +705,9 @@ def test_profile(grad):
 def test_profile_grid():
     m = Minuit(func0, x=1.0, y=2.0)
     m.migrad()
-    y, v = m.profile("y", grid=np.linspace(0, 4, 15))
+    grid = np.linspace(0, 4, 15)
+    y, v = m.profile("y", grid=grid)
+    assert y is grid
     assert len(y) == 15
     assert y[0] == 0
     assert y[-1] == 4
@@ -722,6 +724,16 @@ def test_profile_bad_grid():
         m.profile("y", grid=10)
 
 
+def test_profile_subtract_min_with_nan():
+    def fcn(x, y):
+        return np.nan if y > 3 else func0(x, y)
+
+    m = Minuit(fcn, x=1.0, y=2.0)
+    y, v = m.profile("y", grid=np.linspace(0, 4, 15), subtract_min=True)
+    assert np.nanmin(v) == 0
+    assert_equal(np.isnan(v), y > 3)
+
+
 @pytest.mark.parametrize("grad", (None, func0_grad))
 def test_mnprofile(grad):
     m = Minuit(func0, grad=grad, x=1.0, y=2.0)
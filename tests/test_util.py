@@ -16,6 +16,10 @@ def test_ndim():
     assert ndim((None, None)) == 1
     assert ndim(((1, 2), None)) == 2
     assert ndim((None, (1, 2))) == 2
+    assert ndim(1.5) == 0
+    assert ndim(np.zeros(2)) == 1
+    assert ndim(np.zeros((2, 3))) == 2
+    assert ndim([np.zeros(2)]) == 2
 
 
 def test_BasicView():
@@ -49,6 +53,12 @@ def test_ValueView():
 
     v[:] = (1, 2, 3)
 
+    a = np.asarray(v)
+    assert a.dtype == np.float64
+    assert_equal(a, (1, 2, 3))
+    assert_equal(util.ErrorView(v._minuit), (0.1, 0.1, 0.1))
+    assert_equal(np.asarray(util.ErrorView(v._minuit)), (0.1, 0.1, 0.1))
+
     assert_equal(v[:3], (1, 2, 3))
     assert_equal(v[0:3], (1, 2, 3))
     assert_equal(v[0:10], (1, 2, 3))
@@ -74,6 +84,14 @@ def test_ValueView():
     assert_equal(v[[2, 0]], (3, 1))
     v[["x", "z"]] = (3, 1)
     assert_equal(v, (3, 2, 1))
+    v[:] = np.array((4, 5, 6))
+    assert_equal(v, (4, 5, 6))
+    v[1:] = np.float32(1.5)
+    assert_equal(v, (4, 1.5, 1.5))
+    v[:2] = np.array(2)
+    assert_equal(v, (2, 2, 1.5))
+    with pytest.raises(ValueError):
+        v[:] = np.zeros(2)
 
 
 def test_FixedView_as_mask_for_other_views():
@@ -126,6 +144,8 @@ def test_FixedView_comparison_with_broadcasting():
     f[0] = True
     assert_equal(f, [True, False, False])
     assert f != False
+    assert f == [True, False, False]
+    assert np.asarray(f).dtype == bool
 
 
 def test_Matrix():
@@ -135,6 +155,9 @@ def test_Matrix():
     assert repr(m) == "[[1. 2.]\n [2. 8.]]"
     c = m.correlation()
     assert_allclose(c, ((1.0, 0.5**0.5), (0.5**0.5, 1.0)))
+    m2 = util.Matrix(("a", "b"))
+    m2[:] = [[4, 0], [0, 0]]
+    assert_equal(m2.correlation(), ((1, 0), (0, 0)))
     assert m["a", "b"] == 2.0
     assert m["a", 1] == 2.0
     assert m[1, "a"] == 2.0
@@ -148,8 +171,11 @@ def test_Matrix():
     # this swaps rows and cols
     assert_equal(m[[1, 0]], [[8, 2], [2, 1]])
 
+    assert m.to_table()[0] == [["a", "1", "2"], ["b", "2", "8"]]
     m *= 2
     assert_equal(m, ((2, 4), (4, 16)))
+    # cached formatting must not hide in-place modifications
+    assert m.to_table()[0] == [["a", "2", "4"], ["b", "4", "16"]]
 
     m2 = np.dot(m, (1, 1))
     assert repr(m2) == "[ 6. 20.]"
@@ -194,6 +220,7 @@ def test_Matrix():
 
     assert_equal(m2, m)
     assert m2._var2pos == m._var2pos
+    assert m2._names == m._names == ("a", "b", "c")
 
 
 def test_Param():
@@ -218,6 +245,10 @@ def test_Param():
         "is_const=False, is_fixed=False, lower_limit=42, upper_limit=None)"
     )
 
+    assert p == util.Param(*values)
+    assert p != util.Param(4, *values[1:])
+    assert p != values
+
 
 def test_Params():
     p = util.Params(
@@ -232,6 +263,8 @@ def test_Params():
     assert p[1].number == 1
     assert p["foo"].number == 0
     assert p["bar"].number == 1
+    with pytest.raises(KeyError):
+        p["baz"]
 
 
 def test_MError():
@@ -319,6 +352,10 @@ def test_MErrors():
     )
 
     assert repr(mes) == f"<MErrors\n  {mes['x']!r}\n>"
+    assert mes[0] is mes["x"]
+    assert mes[-1] is mes["x"]
+    with pytest.raises(IndexError):
+        mes[1]
 
 
 @pytest.mark.parametrize("errordef", (0.5, 1.0))